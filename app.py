@@ -8,96 +8,341 @@
 #
 # For full license terms, see the LICENSE file.
 
+import io
+import json
 import streamlit as st
-from datetime import datetime
-import pandas as pd
-from py_bls_api import get_surveys, get_bls_data, get_survey_metadata
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from types import SimpleNamespace
 
+# pandas and py-bls-api (which imports pandas itself) are imported inside the functions
+# that use them, so the page header and sidebar render before their import cost is paid.
 
-@st.cache_data
+
+# The BLS API v2 accepts at most 50 Series IDs per request
+_SERIES_PER_REQUEST = 50
+
+# Upper bound on concurrent BLS API requests for large selections
+_MAX_CONCURRENT_REQUESTS = 4
+
+# Log message py-bls-api adds when a request returns no data at all
+_NO_DATA_MESSAGE = "No data was returned for the specified Series IDs and date range."
+
+# Persisted survey lists and metadata older than this are refetched after the page renders
+_METADATA_MAX_AGE = timedelta(days=1)
+
+# Upper bound on persisted survey metadata entries, comfortably above the surveys py-bls-api supports
+_MAX_PERSISTED_SURVEYS = 100
+
+# Demo (default) API key from Streamlit secrets, looked up once per script run
+_DEMO_REGISTRATIONKEY = st.secrets.get("bls_api_key", "")
+
+# Page styling and header, emitted together in a single markdown call
+_CSS_AND_HEADER = """
+<style>
+[data-testid="baseButton-secondary"] {
+    background-color: #17157a !important;
+    color: white !important;
+}
+
+[data-testid="stSidebar"] {
+    background-color: #f5f7fa;
+}
+
+</style>
+<h1 style='color: #006F96;'>BLS API Explorer</h1>
+<hr style='border: 2px solid #006F96; margin-top: -10px; margin-bottom: 10px;'>
+"""
+
+# Static sidebar content: disclaimer, getting started, and about sections
+_SIDEBAR_CONTENT = """
+<p style="color:red;"> 📢 <b>DISCLAIMER:</b> <br> This application is not affiliated with or endorsed 
+by the U.S. Bureau of Labor Statistics (BLS). It uses public data made available via the BLS Public Data API. 
+BLS.gov cannot vouch for the accuracy or timeliness of data or analyses presented after retrieval.</p>
+
+## Getting Started
+
+Register for a free [API Key](https://data.bls.gov/registrationEngine/) and follow the instructions in the app to begin.
+
+## About the BLS API Explorer
+
+The [BLS API](https://www.bls.gov/developers/) is a data service that provides on-demand access to machine readable metadata and data.
+This app offers a user-friendly interface for exploring the BLS API with **no coding experience required**. 
+
+It's designed for both beginners looking to easily browse data and developers who want dynamic Python code examples for integrating the API into analytical workflows.
+
+## About Me
+
+I created this app because I am passionate about making open data more findable, accessible and usable for everyone. 
+Whether you are new to APIs or an experienced programmer, I hope this tool helps you to explore BLS data more easily.
+
+Happy Data Exploration and Coding!
+
+Connect with me:
+[Github](https://github.com/coding-with-chris/py-bls-api) 
+"""
+
+
+@st.cache_data(persist="disk", max_entries=1)
 def load_surveys():
     """
     Load and cache the list of available BLS surveys that py-bls-api supports.
     
+    The cache is persisted to disk so it survives app restarts. Streamlit ignores ttl for
+    persisted caches, so refresh_stale_caches refetches the list once it is out of date.
+    
     Returns:
-        dict: Dictionary of survey abbreviations and their full names
+        tuple: Dictionary of survey abbreviations and their full names, a sorted tuple
+            of the survey abbreviations, and the time the list was fetched
     """    
-    return get_surveys()
+    from py_bls_api import get_surveys
 
+    datasets = get_surveys()
 
-def configure_user_interface():
+    return datasets, tuple(sorted(datasets)), datetime.now()
+
+
+@st.cache_data(persist="disk", max_entries=_MAX_PERSISTED_SURVEYS, show_spinner=False)
+def fetch_survey_metadata(survey):
     """
-    Configure the page layout and apply custom CSS styling.
-    """    
-    st.set_page_config(page_title="BLS API Explorer", page_icon="⚙️", layout="wide")
+    Fetch and cache the raw metadata for a survey, persisted to disk to survive app restarts.
+    
+    Parameter:
+        survey (str): Survey abbreviation or name understood by py-bls-api
         
-    st.markdown("""
-        <style>
-        [data-testid="baseButton-secondary"] {
-            background-color: #17157a !important;
-            color: white !important;
-        }
+    Returns:
+        tuple: Metadata dictionary for the survey and the time it was fetched
+    """
+    from py_bls_api import get_survey_metadata
+
+    return get_survey_metadata(survey), datetime.now()
+
+
+@st.cache_resource
+def load_metadata(survey):
+    """
+    Load and cache the metadata for a survey as a shared, read-only object.
+    
+    st.cache_resource hands back the same object on every rerun instead of hashing and
+    unpickling a copy the way st.cache_data does, which is slow for large surveys.
+    
+    Parameter:
+        survey (str): Survey abbreviation or name understood by py-bls-api
         
-        [data-testid="stSidebar"] {
-            background-color: #f5f7fa;
-        }
+    Returns:
+        SimpleNamespace: Survey description, year range, data preview, series picklist,
+            a lookup from picklist label to Series ID, each series' year range and the
+            time the metadata was fetched
+    """
+    import pandas as pd
+
+    metadata, fetched_at = fetch_survey_metadata(survey)
+
+    # Combine IDs and titles for the picklist once, rather than on every rerun, using
+    # vectorized string operations on the ID and title columns
+    series_df = pd.DataFrame(metadata['series'], columns=['id', 'title']).fillna('')
+    series_picklist = (series_df['id'] + ': ' + series_df['title']).tolist()
+    label_to_id = dict(zip(series_picklist, series_df['id']))
+    year_ranges = {series['id']: tuple(series['year_range']) for series in metadata['series']}
+
+    # Build the data preview table once so reruns only pay for rendering it
+    preview_df = pd.DataFrame(metadata['data_preview']).drop(columns=['survey_name','survey_abbreviation']).set_index('series_id')
+
+    return SimpleNamespace(description=metadata['survey_description'],
+                           min_year=metadata['survey_minimum_year'],
+                           max_year=metadata['survey_maximum_year'],
+                           preview_df=preview_df,
+                           picklist=series_picklist,
+                           label_to_id=label_to_id,
+                           year_ranges=year_ranges,
+                           fetched_at=fetched_at)
+
+
+def refresh_stale_caches(surveys_fetched_at, survey, metadata_fetched_at):
+    """
+    Refetch the persisted survey list and metadata once they are older than a day.
+    
+    Called after the page has rendered, so a cold start is served from the disk cache
+    straight away and the refreshed copies are picked up on the next rerun.
+    
+    Parameters:
+        surveys_fetched_at (datetime): Time the cached survey list was fetched
+        survey (str): Survey whose metadata is displayed
+        metadata_fetched_at (datetime): Time the cached survey metadata was fetched
+    """
+    now = datetime.now()
+
+    if now - surveys_fetched_at > _METADATA_MAX_AGE:
+        load_surveys.clear()
+        load_surveys()
+
+    # Clearing drops every survey's metadata; the others are refetched when next viewed
+    if now - metadata_fetched_at > _METADATA_MAX_AGE:
+        fetch_survey_metadata.clear()
+        load_metadata.clear()
+        load_metadata(survey)
+
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def fetch_bls(seriesids, startyear, endyear, registrationkey, _year_ranges):
+    """
+    Fetch and cache data from the BLS API so repeat queries skip the network round-trip.
+    
+    Only responses with data and no log messages are cached; anything else is raised as
+    UncachedBLSResponse so a failed request is retried on the next submission.
+    
+    py-bls-api sends one request per 50 Series IDs with the same effective year range, one
+    after another. The IDs are batched the same way here and the batches are fetched
+    concurrently, so the number of API queries is unchanged but latency is bounded by the
+    slowest batch instead of their sum.
+    
+    Parameters:
+        seriesids (tuple): Sorted tuple of Series IDs, hashable and order-independent for caching
+        startyear (int): Start year for the data request
+        endyear (int): End year for the data request
+        registrationkey (str): BLS API key
+        _year_ranges (dict): Lookup from Series ID to its available year range, excluded
+            from the cache key since it follows from the Series IDs
+        
+    Returns:
+        tuple: DataFrames containing the API response data and an empty log
+        
+    Raises:
+        UncachedBLSResponse: If the response has log messages or no data
+    """
+    import pandas as pd
+    from py_bls_api import get_bls_data
+
+    def fetch_batch(batch):
+        return get_bls_data(seriesids=list(batch), 
+                            catalog=True, 
+                            startyear=startyear, 
+                            endyear=endyear, 
+                            registrationkey=registrationkey, 
+                            return_logs=True)
+
+    # Group the Series IDs by the overlap of their year range with the request, as py-bls-api
+    # does, setting aside series with no overlap since they don't generate a request
+    groups = {}
+    no_overlap = []
+    for seriesid in seriesids:
+        series_startyear, series_endyear = _year_ranges[seriesid]
+        effective_range = (max(series_startyear, startyear), min(series_endyear, endyear))
+        if effective_range[0] > effective_range[1]:
+            no_overlap.append(seriesid)
+        else:
+            groups.setdefault(effective_range, []).append(seriesid)
+
+    # Split each group into 50-series batches, adding the series with no overlap to the first
+    # batch so py-bls-api still logs them
+    batches = [group[i:i + _SERIES_PER_REQUEST] for group in groups.values() for i in range(0, len(group), _SERIES_PER_REQUEST)]
+    if batches:
+        batches[0] = batches[0] + no_overlap
+
+    if len(batches) <= 1:
+        data, log = fetch_batch(seriesids)
+
+    else:
+        with ThreadPoolExecutor(max_workers=min(len(batches), _MAX_CONCURRENT_REQUESTS)) as executor:
+            results = list(executor.map(fetch_batch, batches))
+
+        # Combine the batches, keeping the empty frame's columns if nothing came back
+        data_frames = [data for data, _ in results if not data.empty]
+        data = pd.concat(data_frames) if data_frames else results[0][0]
+
+        # Merge the log messages, dropping the "no data" message of empty batches when others returned data
+        log = pd.concat([log for _, log in results]).drop_duplicates().reset_index(drop=True)
+        if not data.empty:
+            log = log[log["log"] != _NO_DATA_MESSAGE].reset_index(drop=True)
+
+    data = downcast_numeric_columns(data)
+    if data.empty or not log.empty:
+        raise UncachedBLSResponse(data, log)
+
+    return data, log
+
+
+class UncachedBLSResponse(Exception):
+    """
+    Raised by fetch_bls to hand back a failed or empty response without caching it.
+    
+    Streamlit does not cache calls that raise, so errors such as a temporary HTTP 503 are
+    retried on the next request instead of being served from the cache for an hour.
+    
+    Parameters:
+        data (pd.DataFrame): DataFrame containing the API response data
+        log (pd.DataFrame): DataFrame containing the log messages or errors
+    """
+    def __init__(self, data, log):
+        super().__init__("The BLS API response contained log messages or no data.")
+        self.data = data
+        self.log = log
+
+
+def downcast_numeric_columns(data):
+    """
+    Shrink the integer columns of a BLS API response to the smallest dtype that holds them.
+    
+    The API returns years as strings, so the year column is parsed to a small integer.
+    Values are left as returned, since casting them to float32 would alter published figures.
+    
+    Parameter:
+        data (pd.DataFrame): DataFrame containing the API response data
+        
+    Returns:
+        pd.DataFrame: The same DataFrame with downcast integer columns
+    """
+    import pandas as pd
+
+    if "year" in data.columns:
+        data["year"] = pd.to_numeric(data["year"], downcast="integer")
+
+    for column in data.select_dtypes("integer").columns:
+        data[column] = pd.to_numeric(data[column], downcast="integer")
+
+    return data
+
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def df_to_csv_bytes(df):
+    """
+    Serialize a DataFrame to CSV bytes and cache the result so reruns don't re-serialize it.
+    
+    Parameter:
+        df (pd.DataFrame): DataFrame to serialize
         
-        </style>
-    """, unsafe_allow_html=True)
+    Returns:
+        bytes: CSV-encoded contents of the DataFrame
+    """
+    buffer = io.BytesIO()
+    df.to_csv(buffer, index=False, chunksize=10_000)
+
+    return buffer.getvalue()
 
 
-def display_app_header():
+def configure_user_interface():
     """
-    Display the application header with custom styling.
+    Configure the page layout, apply custom CSS styling and display the application header.
     """    
-    st.markdown("<h1 style='color: #006F96;'>BLS API Explorer</h1>", unsafe_allow_html=True)
-    st.markdown("<hr style='border: 2px solid #006F96; margin-top: -10px; margin-bottom: 10px;'>", unsafe_allow_html=True)
+    st.set_page_config(page_title="BLS API Explorer", page_icon="⚙️", layout="wide")
+        
+    st.markdown(_CSS_AND_HEADER, unsafe_allow_html=True)
 
 
 def create_sidebar():
     """
     Create the sidebar with disclaimer, getting started information, and about sections.
     """
-    # Display disclaimer about unofficial status
-    st.sidebar.markdown("""
-                        <p style="color:red;"> 📢 <b>DISCLAIMER:</b> <br> This application is not affiliated with or endorsed 
-                        by the U.S. Bureau of Labor Statistics (BLS). It uses public data made available via the BLS Public Data API. 
-                        BLS.gov cannot vouch for the accuracy or timeliness of data or analyses presented after retrieval.</p>
-                        """, unsafe_allow_html=True)
-
-    # Getting started section with API key registration link
-    st.sidebar.header("Getting Started")
-    st.sidebar.markdown("""
-        Register for a free [API Key](https://data.bls.gov/registrationEngine/) and follow the instructions in the app to begin.                            
-        """)
-
-    # About section explaining the BLS API
-    st.sidebar.header("About the BLS API Explorer")
-    st.sidebar.markdown("""
-        The [BLS API](https://www.bls.gov/developers/) is a data service that provides on-demand access to machine readable metadata and data.
-        This app offers a user-friendly interface for exploring the BLS API with **no coding experience required**. 
-        
-        It's designed for both beginners looking to easily browse data and developers who want dynamic Python code examples for integrating the API into analytical workflows.
-                
-        """)
-    st.sidebar.header("About Me")
-    st.sidebar.markdown("""
-        I created this app because I am passionate about making open data more findable, accessible and usable for everyone. 
-        Whether you are new to APIs or an experienced programmer, I hope this tool helps you to explore BLS data more easily.
-                                
-        Happy Data Exploration and Coding!
-                        
-        Connect with me:
-        [Github](https://github.com/coding-with-chris/py-bls-api) 
-        """)
-
-
-def create_survey_picklist(datasets):
+    st.sidebar.markdown(_SIDEBAR_CONTENT, unsafe_allow_html=True)
+
+
+def create_survey_picklist(datasets, options_survey):
     """
     Create a picklist of available BLS datasets.
     
-    Parameter:
+    Parameters:
         datasets (dict): Dictionary of survey abbreviations and their full names
+        options_survey (tuple): Sorted survey abbreviations to offer in the picklist
         
     Returns:
         tuple: Selected survey abbreviation and full name
@@ -105,7 +350,6 @@ def create_survey_picklist(datasets):
     st.markdown("<h3 style='color: #006F96;'>Explore Datasets</h3>", unsafe_allow_html=True)
     col1, col2 = st.columns([.70, .30])
     with col1:
-        options_survey = sorted(list(datasets.keys()))
         survey = st.selectbox('Select a dataset:', options_survey, index=0)    
         survey_name = datasets[survey]
 
@@ -119,11 +363,10 @@ def display_description(description):
     Parameter:
         description (str): Text description of the selected dataset
     """    
-    st.markdown("<h5 style='color: #006F96;'>Dataset Description</h5>", unsafe_allow_html=True)
-
-    # Create a styled box for the description with scrolling if needed
+    # Display the heading and a styled box for the description with scrolling if needed
     st.markdown(
         f"""
+        <h5 style='color: #006F96;'>Dataset Description</h5>
         <div style="background-color: #e1f5fe; color: #000000; padding: 10px; border-left: 5px solid #2196f3;
                     max-height: 200px; overflow-y: auto; border-radius: 5px;">
             {description}
@@ -133,45 +376,24 @@ def display_description(description):
     )
 
 
-def display_data_preview(metadata):
+def display_data_preview(preview_df):
     """
     Display a preview of the survey data with sample data.
     
     Parameter:
-        metadata (dict): Metadata dictionary containing data preview
+        preview_df (pd.DataFrame): Prebuilt data preview indexed by Series ID
     """    
     st.markdown("<h5 style='color: #006F96;'>Data Preview:</h5>", unsafe_allow_html=True)
-    dataset_preview = pd.DataFrame(metadata['data_preview']).drop(columns=['survey_name','survey_abbreviation'])
-    dataset_preview.set_index('series_id', inplace=True)
-    st.dataframe(dataset_preview)
-
-
-def prepare_series_picklist(metadata):    
-    """
-    Prepare the series picklist by combining Series IDs with their titles.
-    
-    Parameter:
-        metadata (dict): Metadata dictionary containing series information
-        
-    Returns:
-        list: Picklist of series IDs and titles
-    """    
-    # Extract series IDs and titles from metadata    
-    series_ids = [series['id'] for series in metadata['series']]
-    series_titles = [series.get('title', '') for series in metadata['series']]  
-
-    # Combine IDs and titles for the picklist
-    series_picklist = [f"{series_id}: {title}" for series_id, title in zip(series_ids, series_titles)]
+    st.dataframe(preview_df)
 
-    return series_picklist
 
-
-def display_api_query_builder(series_picklist, minimum_year, maximum_year):
+def display_api_query_builder(series_picklist, label_to_id, minimum_year, maximum_year):
     """
     Display the API query builder form with input fields for API parameters.
     
     Parameters:
         series_picklist (list): List of series IDs and title strings
+        label_to_id (dict): Lookup from series picklist label to Series ID
         minimum_year (str): Earliest available year for the dataset
         maximum_year (str): Latest available year for the dataset
         
@@ -186,23 +408,13 @@ def display_api_query_builder(series_picklist, minimum_year, maximum_year):
 
         # Create text input for users API key        
         with col3:
-            # Load the demo (default) key from Streamlit secrets
-            demo_registrationkey = st.secrets.get("bls_api_key", "")
-            
-            # Initialize session state for the registration key if it doesn't exist yet
-            if "user_registrationkey" not in st.session_state:
-                st.session_state.user_registrationkey = ""            
-            
+            # Streamlit keeps the entered key in session state across reruns via the widget key
             user_registrationkey = st.text_input("Enter Your BLS API Key", 
-                                                 value=st.session_state.user_registrationkey, 
+                                                 key="user_registrationkey", 
                                                  help="Register for an API key at https://data.bls.gov/registrationEngine/.")
 
-            # Update session state if the user changed the input
-            if user_registrationkey.strip() and user_registrationkey.strip() != st.session_state.user_registrationkey:
-                st.session_state.user_registrationkey = user_registrationkey.strip()
-            
             # Final key to use
-            registrationkey = st.session_state.user_registrationkey or demo_registrationkey
+            registrationkey = user_registrationkey.strip() or _DEMO_REGISTRATIONKEY
 
         # Create year slider
         with col4:
@@ -216,8 +428,8 @@ def display_api_query_builder(series_picklist, minimum_year, maximum_year):
         # Submit button to trigger the API request        
         submit_button = st.form_submit_button('Get Data')
 
-    # Extract just the series IDs from the selected options (remove titles)        
-    seriesids = [series_id.split(':')[0] for series_id in selected_seriesids]
+    # Look up just the series IDs for the selected options (remove titles)        
+    seriesids = [label_to_id[label] for label in selected_seriesids]
 
     return submit_button, registrationkey, startyear, endyear, seriesids
 
@@ -233,7 +445,7 @@ def display_output(data, log, survey):
     """    
     # If there are log messages, display them    
     if not log.empty:        
-        st.write(log)
+        st.dataframe(log)
         
     else:
         # Show success animation (balloons) once
@@ -258,7 +470,7 @@ def display_output(data, log, survey):
 
         # Display the data table        
         st.markdown("<h5 style='color: #006F96;'>Output:</h5>", unsafe_allow_html=True)
-        st.write(data)   
+        st.dataframe(data, use_container_width=True, hide_index=True)
         
         retrieval_date = datetime.today().strftime('%B %d, %Y')
         st.markdown(f"""
@@ -267,8 +479,8 @@ def display_output(data, log, survey):
         st.write("")
 
         # Add CSV download button if data is a DataFrame        
-        if isinstance(data, pd.DataFrame):
-            csv_data = data.to_csv(index=False)
+        if hasattr(data, "to_csv"):
+            csv_data = df_to_csv_bytes(data)
             todays_date = datetime.today().strftime('%Y-%m-%d')
                     
             st.download_button(
@@ -284,49 +496,47 @@ def display_output(data, log, survey):
         st.write("")
         
 
-def display_code(data, seriesids, startyear, endyear, registrationkey, survey_name):
+def build_data_script(seriesids, startyear, endyear, api_key_to_show):
     """
-      Display Python code examples for reproducing the API request using the py-bls-api wrapper.
-        
-      Parameters:
-          data (pd.DataFrame): DataFrame to check if empty
-          seriesids (list): List of selected series IDs
-          startyear (int): Start year for the data request
-          endyear (int): End year for the data request
-          registrationkey (str): BLS API key
-          survey_name (str): Full name of the selected survey
-      """    
-    # Only show code examples if data was successfully retrieved      
-    if not data.empty:
-        st.markdown("<h5 style='color: #006F96;'>Python Code:</h5>", unsafe_allow_html=True)
+    Build the Python code example for retrieving data with the py-bls-api wrapper.
     
-        # Create tabs for different code examples    
-        tab1, tab2, tab3 = st.tabs(["Data", "Metadata", "License"])
-
-        # Only show API key if it is the users.
-        api_key_to_show = "your_api_key" if registrationkey == st.secrets.get("bls_api_key") else registrationkey
-
-        # Code example for retrieving data    
-        with tab1:
-            python_script = f"""
+    Parameters:
+        seriesids (list): List of selected series IDs
+        startyear (int): Start year for the data request
+        endyear (int): End year for the data request
+        api_key_to_show (str): API key to display in the example
+        
+    Returns:
+        str: Python code example
+    """
+    return f"""
             # First, install the required package:
             # pip install py-bls-api
             
             import pandas as pd
             from py_bls_api import get_surveys, get_bls_data, get_survey_metadata
         
-            data, log = get_bls_data(seriesids={seriesids}, 
+            data, log = get_bls_data(seriesids={json.dumps(seriesids)}, 
                                      startyear={startyear}, 
                                      endyear={endyear}, 
                                      registrationkey='{api_key_to_show}', 
                                      return_logs=True)
         
-            """        
-            st.code(python_script, language="python")
+            """
 
-        # Code example for retrieving metadata            
-        with tab2:
-            python_script = f"""
+
+def build_metadata_script(survey_name, api_key_to_show):
+    """
+    Build the Python code example for retrieving metadata with the py-bls-api wrapper.
+    
+    Parameters:
+        survey_name (str): Full name of the selected survey
+        api_key_to_show (str): API key to display in the example
+        
+    Returns:
+        str: Python code example
+    """
+    return f"""
             import pandas as pd
             from py_bls_api import get_surveys, get_survey_metadata, get_data_preview, get_seriesid_metadata, get_popular_seriesids
     
@@ -345,8 +555,38 @@ def display_code(data, seriesids, startyear, endyear, registrationkey, survey_na
             # Returns a list of popular BLS Series IDs for a given survey.
             popular_seriesids = get_popular_seriesids('{survey_name}', '{api_key_to_show}')  
             
-            """        
-            st.code(python_script, language="python")       
+            """
+
+
+def display_code(data, seriesids, startyear, endyear, registrationkey, survey_name):
+    """
+      Display Python code examples for reproducing the API request using the py-bls-api wrapper.
+        
+      Parameters:
+          data (pd.DataFrame): DataFrame to check if empty
+          seriesids (list): List of selected series IDs
+          startyear (int): Start year for the data request
+          endyear (int): End year for the data request
+          registrationkey (str): BLS API key
+          survey_name (str): Full name of the selected survey
+      """    
+    # Only show code examples if data was successfully retrieved      
+    if not data.empty:
+        st.markdown("<h5 style='color: #006F96;'>Python Code:</h5>", unsafe_allow_html=True)
+    
+        # Create tabs for different code examples    
+        tab1, tab2, tab3 = st.tabs(["Data", "Metadata", "License"])
+
+        # Only show API key if it is the users.
+        api_key_to_show = "your_api_key" if registrationkey == _DEMO_REGISTRATIONKEY else registrationkey
+
+        # Code example for retrieving data    
+        with tab1:
+            st.code(build_data_script(seriesids, startyear, endyear, api_key_to_show), language="python")
+
+        # Code example for retrieving metadata            
+        with tab2:
+            st.code(build_metadata_script(survey_name, api_key_to_show), language="python")       
 
         # Display license information           
         with tab3:
@@ -398,60 +638,59 @@ def main():
     """        
     # Setup the UI components
     configure_user_interface()
-    display_app_header()
     create_sidebar()        
 
     # Load and display survey selection    
-    survey = load_surveys()
-    survey, survey_name = create_survey_picklist(survey)
-
-    # Cache metadata to improve performance
-    @st.cache_data
-    def load_metadata(survey):
-        return get_survey_metadata(survey)
+    datasets, options_survey, surveys_fetched_at = load_surveys()
+    survey, survey_name = create_survey_picklist(datasets, options_survey)
 
     # Load metadata and display information
     metadata = load_metadata(survey_name)
-    display_description(metadata['survey_description'])
-    minimum_year = metadata['survey_minimum_year']
-    maximum_year = metadata['survey_maximum_year']
-    display_data_preview(metadata)
+    display_description(metadata.description)
+    minimum_year = metadata.min_year
+    maximum_year = metadata.max_year
+    display_data_preview(metadata.preview_df)
     
     # Prepare and display the series selection and API query builder    
-    series_picklist = prepare_series_picklist(metadata)
-    submitted, registrationkey, startyear, endyear, seriesids = display_api_query_builder(series_picklist, minimum_year, maximum_year)
+    series_picklist = metadata.picklist
+    submitted, registrationkey, startyear, endyear, seriesids = display_api_query_builder(series_picklist, metadata.label_to_id, minimum_year, maximum_year)
 
     # Handle form submission
     if submitted:
-        with st.spinner("Fetching data from the BLS API..."):
-            # Make API request            
-            data, log = get_bls_data(seriesids=seriesids, 
-                                     catalog=True, 
-                                     startyear=startyear, 
-                                     endyear=endyear, 
-                                     registrationkey=registrationkey, 
-                                     return_logs=True)
-
-            # Store results in session state for persistence
-            st.session_state["bls_data"] = data
-            st.session_state["bls_log"] = log
-            st.session_state["bls_params"] = {
-                "seriesids": seriesids,
-                "startyear": startyear,
-                "endyear": endyear,
-                "registrationkey": registrationkey,
-                "survey_name": survey_name,
-                "survey": survey
-            }
-            
-        # Trigger balloons animation on successful data fetch            
-        st.session_state["show_balloons"] = True
+        # Skip the API request if the parameters match the last successful submission
+        params_key = (tuple(sorted(seriesids)), startyear, endyear, registrationkey)
+        if st.session_state.get("last_params_key") != params_key or "bls_data" not in st.session_state:
+            with st.spinner("Fetching data from the BLS API..."):
+                # Make API request, using failed responses without caching them
+                try:
+                    data, log = fetch_bls(params_key[0], startyear, endyear, registrationkey, metadata.year_ranges)
+                except UncachedBLSResponse as response:
+                    data, log = response.data, response.log
+
+                # Store results in session state for persistence
+                st.session_state["bls_data"] = data
+                st.session_state["bls_log"] = log
+
+                # Only skip resubmissions of a successful request, so failures can be retried
+                st.session_state["last_params_key"] = params_key if log.empty and not data.empty else None
+
+            # Trigger balloons animation on successful data fetch            
+            st.session_state["show_balloons"] = True
+
+        st.session_state["bls_params"] = {
+            "seriesids": seriesids,
+            "startyear": startyear,
+            "endyear": endyear,
+            "registrationkey": registrationkey,
+            "survey_name": survey_name,
+            "survey": survey
+        }
 
     # Display results if data exists in session state
-    if "bls_data" in st.session_state and isinstance(st.session_state["bls_data"], pd.DataFrame):
+    if "bls_data" in st.session_state and hasattr(st.session_state["bls_data"], "to_csv"):
         display_output(
             st.session_state["bls_data"],
-            st.session_state.get("bls_log", pd.DataFrame()),
+            st.session_state["bls_log"],
             st.session_state["bls_params"]["survey"]
         )
         display_code(
@@ -462,5 +701,8 @@ def main():
             st.session_state["bls_params"]["registrationkey"],
             st.session_state["bls_params"]["survey_name"]
         )
+
+    # Survey lists and metadata change slowly, so stale cached copies are refreshed last
+    refresh_stale_caches(surveys_fetched_at, survey_name, metadata.fetched_at)
         
 main()        